@@ -3,113 +3,509 @@ AI Task Manager Agent
 Demonstrates OpenAI SDK usage with tool calling
 """
 import os# For environment variables
+import sys# For streaming output to stdout
 import json# For parsing function arguments
+import asyncio# For running parallel tool calls
+import atexit# For flushing the semantic cache on exit
+import time# For the semantic-cache save debounce
+import hashlib# For cache keys
+import random# For retry jitter
+import re# For the zero-token intent fast path
+from types import SimpleNamespace# For synthetic tool calls
+from collections import OrderedDict# For the LRU response cache
+import numpy as np# For semantic-cache cosine similarity
+import msgspec# For fast typed decoding of tool arguments
+import orjson# For precompiled schema bytes and WS frames
 from dotenv import load_dotenv# For loading .env file
-from openai import OpenAI# The OpenAI SDK
+import httpx# For the pooled HTTP/2 transport
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError# The OpenAI SDK (async variant)
 from taskmanager import TaskManager# Our business logic# Load environment variables from .env file
 load_dotenv()
 
+# System prompt and tool schemas are static, so build them once at import
+# time instead of per AITaskAgent instance. Reusing byte-identical request
+# prefixes also lets OpenAI's server-side prompt caching discount the
+# repeated input tokens.
+_SYS_PROMPT = """You are a helpful AI assistant that manages tasks for users.
+                        You can add tasks, list tasks, mark tasks as completed, and provide productivity insights.
+                        Be friendly, encouraging, and help users stay organized and productive.
+                        Always use the available tools to interact with the task management system."""
+
+# Terse prompt for the cheap routing tier: tool selection among four
+# options does not need the large model
+_ROUTER_PROMPT = """You route requests for a task manager.
+Pick the single best tool for the user's message, or reply NONE if no tool applies."""
+
+# Tools whose output is already a complete user-facing message, so a
+# single call can be answered locally without a synthesis model call
+_USER_READY_TOOLS = frozenset({"add_task", "list_tasks", "complete_task", "get_stats"})
+
+# A tuple keeps the collection itself immutable; the dicts are plain JSON
+# so the SDK can serialize them unchanged
+_TOOLS = (
+    {
+        "type": "function",
+        "name": "add_task",
+        "description": "Add a new task to the task manager",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "The title or description of the task"
+                },
+                "priority": {
+                    "type": "string",
+                    "description": "The priority level of the task (high, medium, or low)",
+                    "enum": ["high", "medium", "low"]
+                }
+            },
+            "required": ["title", "priority"],
+            "additionalProperties": False
+        },
+        "strict": True
+    },
+    {
+        "type": "function",
+        "name": "list_tasks",
+        "description": "Get a formatted list of all tasks with their status and priority",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+            "additionalProperties": False
+        },
+        "strict": True
+    },
+    {
+        "type": "function",
+        "name": "complete_task",
+        "description": "Mark a specific task as completed",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "integer",
+                    "description": "The ID of the task to mark as completed"
+                }
+            },
+            "required": ["task_id"],
+            "additionalProperties": False
+        },
+        "strict": True
+    },
+    {
+        "type": "function",
+        "name": "get_stats",
+        "description": "Get productivity statistics and encouraging messages about task completion",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+)
+
+# The schema serialized once at import time. Transports we serialize
+# ourselves (the WebSocket frames) splice these bytes in verbatim instead
+# of re-walking the dict tree on every request; the HTTP SDK path keeps
+# its own encoder, so there the win is limited to the frozen constants.
+_TOOLS_JSON = orjson.dumps(_TOOLS)
+
+# Typed argument structs for each tool. msgspec decodes the model's
+# argument JSON straight into these (~5-10x faster than json.loads into a
+# dict) and validates the shape for free, mirroring the strict schemas the
+# model already sees in _TOOLS.
+class AddTaskArgs(msgspec.Struct):
+    title: str
+    priority: str = "medium"
+
+class CompleteTaskArgs(msgspec.Struct):
+    task_id: int
+
+class NoArgs(msgspec.Struct):
+    pass
+
+# One reusable decoder per tool, built once at import time
+_ARG_DECODERS = {
+    "add_task": msgspec.json.Decoder(AddTaskArgs),
+    "list_tasks": msgspec.json.Decoder(NoArgs),
+    "complete_task": msgspec.json.Decoder(CompleteTaskArgs),
+    "get_stats": msgspec.json.Decoder(NoArgs)
+}
+
 class AITaskAgent:
     def __init__(self):
+        # Explicit pooled HTTP/2 transport: keep-alive connections reuse the
+        # TCP+TLS handshake across chat turns and multiplexed streams let the
+        # embedding and model calls share one socket, instead of the httpx
+        # defaults (HTTP/1.1, small pool) paying handshake cost on cold sockets
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        )
         # Initialize OpenAI client with API key from environment
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self._http
+        )
+        # Optional WebSocket transport for the Responses API (set
+        # OPENAI_RESPONSES_WS=1). One persistent wss connection amortizes the
+        # TCP/TLS handshake over every turn instead of paying it per request.
+        # Falls back to HTTP permanently after repeated failures or a 426.
+        self._use_ws = os.getenv("OPENAI_RESPONSES_WS", "0") == "1"
+        self._ws = None
+        self._ws_failures = 0
+
+        # True when the last chat() already streamed its reply to stdout,
+        # so the caller knows not to print the returned text again
+        self.streamed_last = False
+
         # Create task manager instance for handling task operations
         self.task_manager = TaskManager()
 
-        # Define available tools for the AI to use
-        # Each tool represents a capability the AI can use to help users
-        #(USE PRPOMPT TO BUILD THIS)
-        self.tools = [
-            {
-                "type": "function",
-                "name": "add_task",
-                "description": "Add a new task to the task manager",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "The title or description of the task"
-                        },
-                        "priority": {
-                            "type": "string",
-                            "description": "The priority level of the task (high, medium, or low)",
-                            "enum": ["high", "medium", "low"]
-                        }
-                    },
-                    "required": ["title", "priority"],
-                    "additionalProperties": False
-                },
-                "strict": True
-            },
-            {
-                "type": "function",
-                "name": "list_tasks",
-                "description": "Get a formatted list of all tasks with their status and priority",
-                "parameters": {
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
-                    "additionalProperties": False
-                },
-                "strict": True
-            },
-            {
-                "type": "function",
-                "name": "complete_task",
-                "description": "Mark a specific task as completed",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to mark as completed"
-                        }
-                    },
-                    "required": ["task_id"],
-                    "additionalProperties": False
-                },
-                "strict": True
-            },
-            {
-                "type": "function",
-                "name": "get_stats",
-                "description": "Get productivity statistics and encouraging messages about task completion",
-                "parameters": {
-                    "type": "object",
-                    "properties": {},
-                    "required": [],
-                    "additionalProperties": False
-                },
-                "strict": True
-            }
+        # Exact-match response cache: sha256(user_message + task state) -> reply.
+        # Repeated utterances ("show me my tasks") with unchanged state skip
+        # the whole OpenAI roundtrip. LRU-evicted at _response_cache_size.
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_cache_size = 512
+
+        # Semantic cache: rephrased variants of a cached query ("list tasks
+        # please" vs "show my tasks") reuse its reply when their embeddings
+        # are close enough and the task state matches. Entries are
+        # (state_fp, normalized embedding, reply) in LRU order, persisted
+        # to disk so cold starts keep earlier hits.
+        self._sem_cache: list = []
+        self._sem_cache_size = 256  # cap per state fingerprint
+        self._sem_threshold = 0.92
+        self._sem_cache_file = "semantic_cache.npz"
+        # Persisting rewrites the whole archive (~1.5 MB when full), so
+        # inserts only mark the cache dirty and the actual write is
+        # debounced and offloaded to a worker thread; atexit catches the
+        # remainder, mirroring the tasks.json flush in TaskManager
+        self._sem_dirty = False
+        self._sem_pending = 0
+        self._sem_last_save = time.monotonic()
+        self._load_semantic_cache()
+        atexit.register(self._save_semantic_cache)
+
+        # Zero-token fast path: these utterances map deterministically to a
+        # tool, so the LLM roundtrip is skipped entirely and the tool output
+        # is wrapped in a local template. Each entry is (pattern, builder)
+        # where the builder turns the regex match into (tool name, args json).
+        # Every pattern is anchored to the whole message (politeness and
+        # punctuation aside) so a keyword embedded in a longer request --
+        # "add a task: finish task 3 review writeup" -- can never fire a
+        # tool, especially not a mutation; those fall through to the model.
+        self._fast_paths = [
+            (re.compile(
+                r"^(?:please\s+)?(?:list|show)(?:\s+me)?(?:\s+(?:my|all|the))?"
+                r"\s+tasks?(?:\s+please)?\s*[.!?]*$", re.I),
+             lambda m: ("list_tasks", "{}")),
+            (re.compile(
+                r"^(?:please\s+)?(?:show(?:\s+me)?(?:\s+my)?\s+)?"
+                r"(?:productivity\s+)?stat(?:s|istics)(?:\s+please)?\s*[.!?]*$", re.I),
+             lambda m: ("get_stats", "{}")),
+            (re.compile(
+                r"^(?:please\s+)?(?:complete|finish|mark)\s+task\s+(\d+)"
+                r"(?:\s+(?:as\s+)?(?:completed?|done))?(?:\s+please)?\s*[.!?]*$", re.I),
+             lambda m: ("complete_task", json.dumps({"task_id": int(m.group(1))})))
         ]
+        # Templates wrapping raw tool output into a user-facing reply
+        self._fast_templates = {
+            "list_tasks": "Here are your tasks! 📋\n{result}",
+            "get_stats": "{result}",
+            "complete_task": "{result}"
+        }
+
+        # Bind the module-level tool schemas; these are shared across
+        # instances and never mutated
+        self.tools = _TOOLS
+
+        # Tool dispatch table: one hash lookup per call instead of an
+        # if/elif chain, and new tools plug in without touching execute_tool.
+        # Handlers receive the typed struct produced by _ARG_DECODERS.
+        self._dispatch = {
+            "add_task": lambda args: self.task_manager.add_task(
+                args.title, args.priority
+            ),
+            "list_tasks": lambda args: self.task_manager.list_tasks(),
+            "complete_task": lambda args: self.task_manager.complete_task(
+                args.task_id
+            ),
+            "get_stats": lambda args: self.task_manager.get_stats()
+        }
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections held by the agent."""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+        await self._http.aclose()
+
+    def _ws_connect(self) -> None:
+        """Open the persistent Responses WebSocket session."""
+        # Imported lazily so the WebSocket transport stays optional
+        from websockets.sync.client import connect
+        self._ws = connect(
+            "wss://api.openai.com/v1/responses",
+            additional_headers={
+                "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
+                "OpenAI-Beta": "responses_websockets=2026-02-06"
+            },
+            compression="deflate"
+        )
+
+    def _responses_create_ws(self, **kwargs):
+        """
+        Run one responses.create over the session WebSocket: write the
+        request as a JSON frame, drain streamed frames (output_text deltas
+        included) until response.completed, and parse the final payload
+        into the SDK's Response model so callers see the usual object.
+        """
+        from openai.types.responses import Response
+        if self._ws is None:
+            self._ws_connect()
+        if kwargs.get("tools") is _TOOLS:
+            # Splice the precompiled schema bytes into the frame verbatim
+            kwargs["tools"] = orjson.Fragment(_TOOLS_JSON)
+        frame = orjson.dumps({"type": "response.create", "response": kwargs})
+        self._ws.send(frame.decode())
+        while True:
+            event = orjson.loads(self._ws.recv())
+            event_type = event.get("type")
+            if event_type == "response.completed":
+                self._ws_failures = 0
+                return Response.model_validate(event["response"])
+            if event_type in ("response.failed", "error"):
+                raise RuntimeError(f"WebSocket response failed: {event}")
+
+    async def _responses_create(self, **kwargs):
+        """
+        Transport-selecting wrapper around responses.create. Prefers the
+        persistent WebSocket when enabled; a 426 or three consecutive
+        failures stick the agent back on plain HTTP for the session.
+        """
+        if self._use_ws:
+            try:
+                # The WebSocket client is synchronous; keep the event loop
+                # free by running the roundtrip in a worker thread
+                return await asyncio.to_thread(self._responses_create_ws, **kwargs)
+            except Exception as exc:
+                if self._ws is not None:
+                    try:
+                        self._ws.close()
+                    except Exception:
+                        pass
+                    self._ws = None
+                self._ws_failures += 1
+                status = getattr(getattr(exc, "response", None), "status_code", None)
+                if status == 426 or self._ws_failures >= 3:
+                    self._use_ws = False
+
+        # Bounded retry with exponential backoff + jitter. Rate limits,
+        # dropped connections and 5xx are transient: a sub-second retry
+        # beats losing the whole turn to an error string. Validation and
+        # other 4xx errors are raised immediately, never retried.
+        delay = 0.25
+        for attempt in range(4):
+            try:
+                return await self.client.responses.create(**kwargs)
+            except (APIConnectionError, APIStatusError) as exc:
+                status = getattr(exc, "status_code", None)
+                transient = status is None or status == 429 or status >= 500
+                if not transient or attempt == 3:
+                    raise
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2.0, 4.0)
+
+    async def _fast_path(self, user_message: str):
+        """
+        Try the keyword fast path: if the message matches a known intent,
+        execute the mapped tool directly and format its output locally.
+        Returns the reply string, or None when the LLM should handle it.
+        """
+        for pattern, build in self._fast_paths:
+            match = pattern.search(user_message)
+            if match:
+                name, arguments = build(match)
+                # Synthetic tool call shaped like the SDK's function_call items
+                tool_call = SimpleNamespace(name=name, arguments=arguments)
+                result = await self._execute_tool_async(tool_call)
+                return self._fast_templates[name].format(result=result)
+        return None
+
+    async def _stream_final(self, **kwargs) -> str:
+        """
+        Stream a response's output_text deltas to stdout as they arrive and
+        return the accumulated text for caching. Perceived latency becomes
+        time-to-first-token instead of full generation time.
+        """
+        chunks = []
+        async with self.client.responses.stream(**kwargs) as stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    sys.stdout.write(event.delta)
+                    sys.stdout.flush()
+                    chunks.append(event.delta)
+        self.streamed_last = True
+        return "".join(chunks)
+
+    async def _execute_tool_async(self, tool_call):
+        """
+        Async wrapper around execute_tool. TaskManager does blocking file
+        I/O, so each call runs in a worker thread and asyncio.gather can
+        overlap the tools of one turn instead of running them back to back.
+        """
+        return await asyncio.to_thread(self.execute_tool, tool_call)
 
     def execute_tool(self, tool_call):
         """
         Execute the requested tool and return its result.
         This is where we map tool calls to actual TaskManager methods.
         """
-        # Extract tool name and arguments
+        # Extract tool name and decode arguments into the typed struct;
+        # decoding validates the payload shape at the same time
         name = tool_call.name
-        args = json.loads(tool_call.arguments)
-        
-        # Map tool calls to TaskManager methods
-        if name == "add_task":
-            return self.task_manager.add_task(
-                args["title"],
-                args.get("priority", "medium")
-            )
-        elif name == "list_tasks":
-            return self.task_manager.list_tasks()
-        elif name == "complete_task":
-            return self.task_manager.complete_task(args["task_id"])
-        elif name == "get_stats":
-            return self.task_manager.get_stats()
-        else:
+        decoder = _ARG_DECODERS.get(name)
+        if decoder is None:
             return f"Unknown tool: {name}"
+        try:
+            args = decoder.decode(tool_call.arguments)
+        except msgspec.ValidationError as e:
+            return f"Invalid arguments for {name}: {e}"
+
+        # Single dict lookup routes to the right TaskManager method
+        return self._dispatch[name](args)
+
+    def _cache_key(self, user_message: str, state_fp: str) -> str:
+        """
+        Build the exact-match cache key for a user message.
+        The task-state fingerprint is mixed in so any add/complete
+        invalidates stale replies automatically.
+        """
+        raw = user_message + "|" + state_fp
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_response(self, key: str, state_fp: str, reply: str,
+                        embedding=None) -> str:
+        """
+        Store a reply in the LRU cache, evicting the oldest entry when full.
+        Replies from turns that mutated the task state are not cached:
+        replaying them from cache would skip the mutation itself.
+        """
+        if self.task_manager.state_fingerprint() != state_fp:
+            return reply
+        self._response_cache[key] = reply
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+        if embedding is not None:
+            self._semantic_store(state_fp, embedding, reply)
+        return reply
+
+    async def _embed(self, text: str):
+        """Embed text once and L2-normalize so dot product equals cosine."""
+        result = await self.client.embeddings.create(
+            model="text-embedding-3-small",
+            input=text
+        )
+        emb = np.asarray(result.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+
+    def _semantic_lookup(self, embedding, state_fp: str):
+        """
+        Return the cached reply whose query embedding is most similar to
+        this one (cosine >= threshold), restricted to entries recorded
+        under the same task-state fingerprint. Returns None on miss.
+        """
+        candidates = [
+            (i, entry) for i, entry in enumerate(self._sem_cache)
+            if entry[0] == state_fp
+        ]
+        if not candidates:
+            return None
+        # One matmul over the stacked (N, 1536) matrix instead of N dots
+        matrix = np.stack([entry[1] for _, entry in candidates])
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self._sem_threshold:
+            return None
+        # Refresh LRU position of the hit
+        index = candidates[best][0]
+        self._sem_cache.append(self._sem_cache.pop(index))
+        return candidates[best][1][2]
+
+    def _semantic_store(self, state_fp: str, embedding, reply: str) -> None:
+        """Record a (state, query embedding, reply) entry, LRU-capped per state."""
+        self._sem_cache.append((state_fp, embedding, reply))
+        same_fp = [i for i, entry in enumerate(self._sem_cache)
+                   if entry[0] == state_fp]
+        if len(same_fp) > self._sem_cache_size:
+            del self._sem_cache[same_fp[0]]
+        self._sem_dirty = True
+        self._sem_pending += 1
+        self._maybe_save_semantic_cache()
+
+    def _maybe_save_semantic_cache(self) -> None:
+        """
+        Persist once enough inserts accumulated or the debounce window
+        elapsed, handing the write to a worker thread so the event loop
+        never blocks on the archive rewrite.
+        """
+        if self._sem_pending < 8 and time.monotonic() - self._sem_last_save < 5.0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_semantic_cache()
+        else:
+            loop.create_task(asyncio.to_thread(self._save_semantic_cache))
+
+    def _load_semantic_cache(self) -> None:
+        """Reload persisted semantic-cache entries, ignoring a missing/bad file."""
+        try:
+            data = np.load(self._sem_cache_file, allow_pickle=False)
+            self._sem_cache = [
+                (str(fp), emb, str(reply))
+                for fp, emb, reply in zip(
+                    data["state_fps"], data["embeddings"], data["replies"]
+                )
+            ]
+        except (OSError, KeyError, ValueError):
+            self._sem_cache = []
+
+    def _save_semantic_cache(self) -> None:
+        """Persist the semantic cache as one .npz archive for cold starts."""
+        if not self._sem_dirty:
+            return
+        # Snapshot first: this may run on a worker thread while the event
+        # loop keeps appending entries
+        entries = list(self._sem_cache)
+        if not entries:
+            return
+        self._sem_dirty = False
+        self._sem_pending = 0
+        self._sem_last_save = time.monotonic()
+        # Write to a temp file and swap it in so a reader (or a crash
+        # mid-write) never sees a truncated archive
+        tmp_file = self._sem_cache_file + ".tmp.npz"
+        np.savez(
+            tmp_file,
+            state_fps=np.array([entry[0] for entry in entries]),
+            embeddings=np.stack([entry[1] for entry in entries]),
+            replies=np.array([entry[2] for entry in entries])
+        )
+        os.replace(tmp_file, self._sem_cache_file)
 
-    def chat(self, user_message: str) -> str:
+    async def chat(self, user_message: str) -> str:
         """
         Process user message and return AI response using the new tool calling structure.
         This method demonstrates the complete flow of:
@@ -118,66 +514,113 @@ class AITaskAgent:
         3. Result incorporation
         4. Final response generation
         """
+        self.streamed_last = False
+
+        # Fast path first: deterministic intents ("show my tasks",
+        # "complete task 3") cost zero tokens and no network at all
+        fast_reply = await self._fast_path(user_message)
+        if fast_reply is not None:
+            return fast_reply
+
+        # Cache check: identical utterance + identical task state means the
+        # previous reply is still correct, so skip the OpenAI calls entirely
+        state_fp = self.task_manager.state_fingerprint()
+        cache_key = self._cache_key(user_message, state_fp)
+        if cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            return self._response_cache[cache_key]
+
+        # Semantic cache check: catch rephrasings the exact-match key misses.
+        # The embedding call is cheap compared to a full model roundtrip and
+        # is only an optimization, so failures fall through to the normal flow.
+        embedding = None
+        try:
+            embedding = await self._embed(user_message)
+            cached_reply = self._semantic_lookup(embedding, state_fp)
+            if cached_reply is not None:
+                return cached_reply
+        except Exception:
+            pass
+
         try:
-            # Step 1: Initial request to the model
-            # The model will decide if it needs to use any tools
-            response = self.client.responses.create(
-                model="gpt-4.1",
+            # Step 1: Cheap routing tier. Selecting one of four tools does
+            # not need the large model, so gpt-4o-mini decides first
+            # (~10x cheaper and faster than going straight to gpt-4.1)
+            response = await self._responses_create(
+                model="gpt-4o-mini",
                 input=[
-                    {
-                        "role": "system",
-                        "content": """You are a helpful AI assistant that manages tasks for users. 
-                        You can add tasks, list tasks, mark tasks as completed, and provide productivity insights.
-                        Be friendly, encouraging, and help users stay organized and productive.
-                        Always use the available tools to interact with the task management system."""
-                    },
+                    {"role": "system", "content": _ROUTER_PROMPT},
                     {"role": "user", "content": user_message}
                 ],
                 tools=self.tools,
                 tool_choice="auto"
             )
-            
-            # Step 2: Check if model wants to use any tools
-            if response.output and response.output[0].type == "function_call":
-                # Get the tool call details
-                tool_call = response.output[0]
-                
-                # Step 3: Execute the requested tool
-                tool_result = self.execute_tool(tool_call)
-                
-                # Step 4: Supply the result back to the model
-                # We append both the tool call and its result to the conversation
-                input_messages = [
-                    {
-                        "role": "system",
-                        "content": """You are a helpful AI assistant that manages tasks for users. 
-                        Be friendly, encouraging, and help users stay organized and productive."""
-                    },
-                    {"role": "user", "content": user_message},
-                    tool_call,  # The model's tool call
-                    {
-                        "type": "function_call_output",
-                        "call_id": tool_call.call_id,
-                        "output": str(tool_result)
-                    }
-                ]
-                
-                # Step 5: Get final response incorporating the tool result
-                final_response = self.client.responses.create(
+
+            # Step 2: Collect every tool call the router emitted this turn
+            tool_calls = [
+                item for item in (response.output or [])
+                if item.type == "function_call"
+            ]
+            if tool_calls:
+                # Step 3: Execute all requested tools concurrently; models
+                # that emit parallel tool calls no longer serialize them
+                tool_results = await asyncio.gather(
+                    *(self._execute_tool_async(tc) for tc in tool_calls)
+                )
+
+                # A single user-ready tool output needs no synthesis at
+                # all; wrap it locally and skip the second model call
+                if (len(tool_calls) == 1
+                        and tool_calls[0].name in _USER_READY_TOOLS):
+                    template = self._fast_templates.get(
+                        tool_calls[0].name, "{result}"
+                    )
+                    reply = template.format(result=tool_results[0])
+                    return self._cache_response(cache_key, state_fp,
+                                                reply, embedding)
+
+                # Step 4: Multiple results need weaving into one reply, so
+                # hand them to the large model and stream its output.
+                # previous_response_id reuses the server-side state from the
+                # routing call, so this leg only sends the tool outputs plus
+                # the assistant persona: the chained state only carries
+                # _ROUTER_PROMPT, which tells the model to pick tools, not
+                # how to talk to the user. tools is omitted: the
+                # continuation only narrates results.
+                final_text = await self._stream_final(
                     model="gpt-4.1",
-                    input=input_messages,
-                    tools=self.tools
+                    previous_response_id=response.id,
+                    input=[
+                        {"role": "system", "content": _SYS_PROMPT}
+                    ] + [
+                        {
+                            "type": "function_call_output",
+                            "call_id": tool_call.call_id,
+                            "output": str(tool_result)
+                        }
+                        for tool_call, tool_result in zip(tool_calls, tool_results)
+                    ]
                 )
-                
-                return final_response.output_text
+
+                return self._cache_response(cache_key, state_fp,
+                                            final_text, embedding)
             else:
-                # If no tools were needed, return the direct response
-                return response.output_text
-                
+                # No tool applies: this is a conversational turn, which is
+                # exactly what needs the large model and the full prompt
+                response = await self._responses_create(
+                    model="gpt-4.1",
+                    input=[
+                        {"role": "system", "content": _SYS_PROMPT},
+                        {"role": "user", "content": user_message}
+                    ]
+                )
+                return self._cache_response(cache_key, state_fp,
+                                            response.output_text, embedding)
+
         except Exception as e:
             return f"Sorry, I encountered an error: {str(e)}"
 
-def main():
+async def main():
     """
     Main entry point of the application.
     Sets up the interactive command-line interface for the task manager.
@@ -195,23 +638,42 @@ def main():
     # Create the AI agent instance
     agent = AITaskAgent()
     
-    # Main interaction loop
-    while True:
-        # Get user input
-        user_input = input("You: ").strip()
-        
-        # Check for exit command
-        if user_input.lower() in ['quit', 'exit', 'bye']:
-            print("👋 Goodbye! Stay productive!")
-            break
-        
-        # Skip empty input
-        if not user_input:
-            continue
-        
-        # Get and display AI response
-        print("🤖 Agent:", agent.chat(user_input))
-        print()
+    # Main interaction loop. Reading sys.stdin directly skips input()'s
+    # readline machinery and the extra string copy it makes per line.
+    try:
+        while True:
+            # Show the prompt and read one raw line
+            sys.stdout.write("You: ")
+            sys.stdout.flush()
+            line = sys.stdin.readline()
+
+            # Empty read means EOF (Ctrl-D / closed pipe)
+            if not line:
+                print("\n👋 Goodbye! Stay productive!")
+                break
+
+            user_input = line.strip()
+
+            # Check for exit command
+            if user_input.lower() in ['quit', 'exit', 'bye']:
+                print("👋 Goodbye! Stay productive!")
+                break
+
+            # Skip empty input
+            if not user_input:
+                continue
+
+            # Get and display AI response; streamed replies are already on
+            # screen by the time chat() returns, so only print the rest
+            print("🤖 Agent: ", end="", flush=True)
+            reply = await agent.chat(user_input)
+            print("" if agent.streamed_last else reply)
+            print()
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye! Stay productive!")
+    finally:
+        # Release pooled connections before the loop shuts down
+        await agent.close()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
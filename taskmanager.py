@@ -1,11 +1,20 @@
 """
 Simple task management system for the AI agent
 """
-import json
+import atexit
+import mmap
+import orjson
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+# Display lookups for list_tasks, built once at import time instead of
+# per task inside the formatting loop
+_PRIO_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+_PRIO_ORDER = {"high": 0, "medium": 1, "low": 2}
 
 @dataclass
 class Task:
@@ -17,7 +26,9 @@ class Task:
     title: str
     priority: str
     completed: bool = False
-    created_at: str = datetime.now().isoformat()
+    # default_factory runs per instance; a plain default would be evaluated
+    # once at class definition, stamping every Task with the import time
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
 class TaskManager:
     """
@@ -33,39 +44,120 @@ class TaskManager:
             tasks_file (str): Path to the JSON file storing tasks
         """
         self.tasks_file = tasks_file
-        self.tasks = self._load_tasks()  # Store tasks in a dictionary with ID as key
+        self.tasks = self._load_tasks()  # Ordered list of task dicts for display
+        # Index by id so complete_task is one hash lookup instead of a scan;
+        # the dict shares the task dicts with the list, so updates stay in sync
+        self._by_id: Dict[int, Dict] = {t["id"]: t for t in self.tasks}
+        # Next free id survives completions/deletions, unlike len(tasks) + 1
+        self._next_id = max(self._by_id, default=0) + 1
+        # Running counters keep get_stats O(1) instead of rescanning the list
+        self._total = len(self.tasks)
+        self._completed = sum(1 for t in self.tasks if t["completed"])
+        # Mutators run on worker threads when the agent gathers parallel
+        # tool calls, so id/counter updates and flushes must be serialized.
+        # RLock because _flush is reached both directly and from mutators.
+        self._lock = threading.RLock()
+        # Debounced persistence: mutations mark the list dirty and bursts
+        # coalesce into one disk write instead of re-serializing per op
+        self._dirty = False
+        self._pending_ops = 0
+        self._last_flush = time.monotonic()
+        atexit.register(self._flush)  # Never lose writes on clean shutdown
+
+    def state_fingerprint(self) -> str:
+        """
+        Return a cheap fingerprint of the current task state.
+
+        The fingerprint changes whenever a task is added or completed,
+        so anything cached against it (e.g. AI responses) is invalidated
+        automatically without scanning full task contents.
+
+        Returns:
+            str: Compact string that changes on any task mutation
+        """
+        try:
+            # File mtime catches external edits to tasks.json as well
+            mtime = os.path.getmtime(self.tasks_file)
+        except OSError:
+            mtime = 0.0
+        completed_ids = sum(t["id"] for t in self.tasks if t["completed"])
+        return f"{len(self.tasks)}:{mtime}:{completed_ids}"
 
     def _load_tasks(self) -> List[Dict]:
         """Load tasks from JSON file"""
         try:
-# Try to open and read the existing tasks file
-            with open(self.tasks_file, 'r') as f:
-                return json.load(f)
+# Memory-map the existing tasks file and parse it in place: no
+# intermediate Python string, so peak memory stays at one copy of
+# the data even as the history grows
+            with open(self.tasks_file, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+# mmap rejects zero-length files; an empty file means no tasks
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+# memoryview gives orjson zero-copy access to the mapping
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
         except FileNotFoundError:
 # If file doesn't exist yet, start with empty list
             return []
     
     def _save_tasks(self) -> None:
         """
-        Private method to save tasks to JSON file.
-        Converts Task objects to dictionaries before saving.
+        Private method called by mutators after changing the task list.
+        Marks the in-memory state dirty and flushes only when the debounce
+        window allows, so a burst of mutations costs one disk write.
         """
-        with open(self.tasks_file, 'w') as f:
-            json.dump(self.tasks, f, indent=2)
+        self._dirty = True
+        self._pending_ops += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        """Flush once enough ops accumulated or the debounce window elapsed."""
+        if self._dirty and (
+            self._pending_ops >= 16
+            or time.monotonic() - self._last_flush > 1.0
+        ):
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Write the task list to disk atomically: serialize to a temp file
+        and os.replace it over tasks.json so readers never see a partial
+        write. Compact separators keep the hot-path write small.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_file = self.tasks_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(self.tasks))
+            os.replace(tmp_file, self.tasks_file)
+            self._dirty = False
+            self._pending_ops = 0
+            self._last_flush = time.monotonic()
 
     def add_task(self, title: str, priority: str = "medium") -> str:
         """Add a new task"""
 # Create a new task dictionary with all required fields
+        created_at = datetime.now().isoformat()  # Compute the timestamp once
         task = {
-            "id": len(self.tasks) + 1,# Simple ID generation
+            "id": None,# Monotonic id, assigned under the lock below
             "title": title,# Task description
             "priority": priority.lower(),# Normalize priority
             "completed": False,# New tasks start incomplete
-            "created_at": datetime.now().isoformat()# Timestamp
+            "created_at": created_at# Timestamp
         }
-# Add to our tasks list and save to file
-        self.tasks.append(task)
-        self._save_tasks()
+# Add to the ordered list and the id index, then save to file.
+# The lock covers id assignment through save so two parallel adds
+# can never mint the same id or interleave a flush
+        with self._lock:
+            task["id"] = self._next_id
+            self._next_id += 1
+            self.tasks.append(task)
+            self._by_id[task["id"]] = task
+            self._total += 1
+            self._save_tasks()
         return f"Task '{title}' added with {priority} priority"
     
     
@@ -79,26 +171,23 @@ class TaskManager:
         if not self.tasks:
             return "📝 No tasks found!"
         
-        # Sort tasks by priority and completion status
+        # Sort tasks by completion status, then real priority rank
+        # (high before low) rather than alphabetical priority strings
         sorted_tasks = sorted(
             self.tasks,
-            key=lambda x: (x["completed"], x["priority"])
+            key=lambda x: (x["completed"], _PRIO_ORDER.get(x["priority"], 3))
         )
-        
-        # Format each task with appropriate emojis
+
+        # Format each task with appropriate emojis; the lookup tables are
+        # module constants, so the loop allocates nothing but the lines
         task_lines = []
         for task in sorted_tasks:
             status = "✅" if task["completed"] else "⏳"
-            priority_emoji = {
-                "high": "🔴",
-                "medium": "🟡",
-                "low": "🟢"
-            }.get(task["priority"].lower(), "⚪")
-            
+            priority_emoji = _PRIO_EMOJI.get(task["priority"], "⚪")
             task_lines.append(
                 f"{status} {priority_emoji} Task {task['id']}: {task['title']}"
             )
-        
+
         return "\n".join(task_lines)
     
     def complete_task(self, task_id: int) -> str:
@@ -111,14 +200,20 @@ class TaskManager:
         Returns:
             str: Success or failure message
         """
-        # Find task with matching ID
-        for task in self.tasks:
-            if task["id"] == task_id:
+        # Single hash lookup instead of scanning the whole list; the lock
+        # keeps the flip, counter and flush atomic across worker threads
+        with self._lock:
+            task = self._by_id.get(task_id)
+            if task is None:
+                return f"Task with ID {task_id} not found! ❌"
+
+            # Only count a genuine False -> True flip so double-completing
+            # a task cannot inflate the completed counter
+            if not task["completed"]:
                 task["completed"] = True
+                self._completed += 1
                 self._save_tasks()
-                return f"Task '{task['title']}' marked as completed! 🎉"
-        
-        return f"Task with ID {task_id} not found! ❌"
+            return f"Task '{task['title']}' marked as completed! 🎉"
     
     def get_stats(self) -> str:
         """
@@ -127,9 +222,10 @@ class TaskManager:
         Returns:
             str: Formatted statistics and encouragement
         """
-        total_tasks = len(self.tasks)
-        completed_tasks = sum(1 for task in self.tasks if task["completed"])
-        
+        # Counters are maintained by add_task/complete_task, so no scan here
+        total_tasks = self._total
+        completed_tasks = self._completed
+
         if total_tasks == 0:
             return "📊 No tasks yet! Time to get started! 🚀"
         